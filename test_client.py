@@ -6,118 +6,267 @@ Simple Python client to test the breadcrumbs HTTP API.
 This demonstrates how external systems can interact with the diagnostic server.
 """
 
-import requests
+import asyncio
 import json
+import ssl
 import sys
+import threading
 import time
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
+
+import httpx
+import ijson
+import orjson
 
-# Set up detailed logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Built once at import so the CA bundle is parsed a single time and shared by
+# every client instance, instead of once per new HTTPS connection.
+_SSL_CONTEXT = ssl.create_default_context()
+
+# Probe messages shared by the sync client helpers and the async test suite
+_VPN_PROBE_MESSAGE = "Check my VPN status and provide detailed information"
+_NETWORK_PROBE_MESSAGE = "Run network diagnostics and check connectivity issues"
+
+# Chat reply fields the callers actually read; streaming parse keeps only these
+_CHAT_FIELDS = ("response", "conversation_id", "tools_used", "error")
+
+# Bodies below this size are decoded in one shot - a streaming parser only
+# pays off once the reply is big enough to be worth not buffering
+_STREAM_THRESHOLD = 16 * 1024
+
+class _IterReader:
+    """Minimal file-like wrapper so ijson can pull from an httpx byte stream"""
+
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self._buffer = b""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._iterator)
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
 class BreadcrumbsClient:
-    """Client for interacting with the Breadcrumbs HTTP API"""
-    
-    def __init__(self, base_url: str = "http://localhost:8181", api_key: str = "demo-key-123"):
+    """Client for interacting with the Breadcrumbs HTTP API.
+
+    Construction sets up the connection pool and pre-computes the request
+    headers, so instances are meant to be created once and reused for every
+    request, not rebuilt per call.
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8181", api_key: str = "demo-key-123",
+                 eager_connect: bool = True):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {api_key}'
-        })
-    
-    def health_check(self) -> Dict[str, Any]:
-        """Check if the server is healthy"""
-        url = f"{self.base_url}/api/v1/health"
-        logger.info(f"🏥 Health check request to: {url}")
-        logger.debug(f"📋 Headers: {dict(self.session.headers)}")
-        
+        # Auth header built exactly once; everything downstream (the session,
+        # the cached debug repr) reuses the same string
+        self._auth = f'Bearer {api_key}'
+        self._base_headers = (('Content-Type', 'application/json'),
+                              ('Authorization', self._auth),
+                              # Compressed diagnostic dumps are a fraction of
+                              # their JSON size on the wire
+                              ('Accept-Encoding', 'gzip, deflate'))
+        # HTTP/2 when the server offers it (multiplexed, HPACK-compressed
+        # headers), HTTP/1.1 keep-alive otherwise; connections persist for
+        # the life of the client so only the first request pays a handshake.
+        self.session = httpx.Client(
+            base_url=self.base_url,
+            headers=dict(self._base_headers),
+            http2=True,
+            verify=_SSL_CONTEXT,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16))
+        # Session headers never change after construction; cache the repr so
+        # DEBUG logging doesn't copy the headers mapping on every request
+        self._headers_repr = repr(dict(self.session.headers))
+        # Request paths built once; httpx prepends base_url on each call
+        self._url_health = "/api/v1/health"
+        self._url_tools = "/api/v1/tools"
+        self._url_chat = "/api/v1/chat"
+        self._url_batch = "/api/v1/batch"
+        if eager_connect:
+            # Warm the pooled connection (TCP + TLS handshake) in the
+            # background so the first real request doesn't pay for it
+            threading.Thread(target=self._preconnect, daemon=True).start()
+
+    def _preconnect(self):
+        """Open the keep-alive connection with a throwaway HEAD request"""
+        try:
+            self.session.head(self._url_health, timeout=5)
+        except httpx.HTTPError:
+            pass
+
+    def _request(self, method: str, path: str, label: str, *,
+                 payload: Any = None, timeout: float = 10,
+                 stream_fields: Optional[tuple] = None,
+                 error_extra: Optional[Dict[str, Any]] = None) -> Any:
+        """Issue one API request and decode the reply.
+
+        All the scaffolding the public methods share lives here: the
+        request/response logging, the non-2xx and transport-error handling
+        (both surface as an error dict rather than an exception), and the
+        body decode. With stream_fields set, large replies are parsed
+        incrementally and only those fields are kept.
+        """
+        logger.info("[REQ] %s request to: %s", label, path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[REQ] Headers: %s", self._headers_repr)
+            if payload is not None:
+                logger.debug("[REQ] Payload: %s",
+                             orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode())
+
+        content = orjson.dumps(payload) if payload is not None else None
         try:
-            logger.debug("🔄 Sending GET request...")
-            response = self.session.get(url, timeout=10)
-            logger.info(f"📊 Response status: {response.status_code}")
-            logger.debug(f"📋 Response headers: {dict(response.headers)}")
-            logger.debug(f"📤 Response content: {response.text}")
-            
-            response.raise_for_status()
-            result = response.json()
-            logger.info("✅ Health check successful")
+            logger.debug("[REQ] Sending %s request...", method)
+            with self.session.stream(method, path, content=content,
+                                     timeout=timeout) as response:
+                logger.info("[RESP] Response status: %s", response.status_code)
+                if not response.is_success:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[RESP] Response headers: %s", response.headers)
+                    logger.error("[ERR] %s failed: HTTP %s %s", label,
+                                 response.status_code, response.reason_phrase)
+                    return {"error": response.reason_phrase,
+                            "status_code": response.status_code,
+                            **(error_extra or {})}
+
+                if stream_fields is not None:
+                    result = self._parse_response(response, stream_fields)
+                else:
+                    body = response.read()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[RESP] Response content: %s", body[:4096])
+                    result = orjson.loads(body)
+            logger.info("[OK] %s successful", label)
             return result
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Health check failed: {e}")
-            logger.error(f"❌ Error type: {type(e)}")
-            return {"error": str(e), "status": "unhealthy"}
-    
+        except (httpx.HTTPError, orjson.JSONDecodeError, ijson.JSONError) as e:
+            logger.error("[ERR] %s failed: %s", label, e)
+            logger.error("[ERR] Error type: %s", type(e))
+            return {"error": str(e), **(error_extra or {})}
+
+    @staticmethod
+    def _parse_response(response, fields) -> Dict[str, Any]:
+        """Decode a reply, streaming large bodies instead of buffering them.
+
+        Small replies are decoded in one shot with orjson, which beats a
+        streaming parser on tiny payloads. Anything larger (or of unknown
+        length) is parsed incrementally with ijson, keeping only the given
+        fields, so memory stays bounded no matter how much diagnostic
+        output the AI embeds in the reply.
+        """
+        # Content-Length is the wire size; with a Content-Encoding it says
+        # nothing about how big the decoded body is, so only trust it for
+        # the buffered fast path on unencoded replies
+        length = int(response.headers.get('Content-Length') or 0)
+        if 'Content-Encoding' not in response.headers and 0 < length < _STREAM_THRESHOLD:
+            body = response.read()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[RESP] Response content: %s", body[:4096])
+            return orjson.loads(body)
+
+        return {key: value
+                for key, value in ijson.kvitems(_IterReader(response.iter_bytes()), '')
+                if key in fields}
+
+    def health_check(self) -> Dict[str, Any]:
+        """Check if the server is healthy"""
+        return self._request("GET", self._url_health, "Health check",
+                             error_extra={"status": "unhealthy"})
+
     def list_tools(self) -> Dict[str, Any]:
         """Get list of available diagnostic tools"""
-        url = f"{self.base_url}/api/v1/tools"
-        logger.info(f"🔧 Tools list request to: {url}")
-        logger.debug(f"📋 Headers: {dict(self.session.headers)}")
-        
-        try:
-            logger.debug("🔄 Sending GET request...")
-            response = self.session.get(url, timeout=10)
-            logger.info(f"📊 Response status: {response.status_code}")
-            logger.debug(f"📋 Response headers: {dict(response.headers)}")
-            logger.debug(f"📤 Response content: {response.text}")
-            
-            response.raise_for_status()
-            result = response.json()
-            logger.info("✅ Tools list successful")
-            return result
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Tools list failed: {e}")
-            logger.error(f"❌ Error type: {type(e)}")
-            return {"error": str(e)}
-    
+        return self._request("GET", self._url_tools, "Tools list")
+
     def send_message(self, message: str, conversation_id: Optional[str] = None, tools_enabled: bool = True) -> Dict[str, Any]:
         """Send a diagnostic message to the AI"""
-        url = f"{self.base_url}/api/v1/chat"
         payload = {
             "message": message,
             "tools_enabled": tools_enabled
         }
-        
+
         if conversation_id:
             payload["conversation_id"] = conversation_id
-        
-        logger.info(f"💬 Chat request to: {url}")
-        logger.debug(f"📋 Headers: {dict(self.session.headers)}")
-        logger.debug(f"📤 Payload: {json.dumps(payload, indent=2)}")
-        
-        try:
-            logger.debug("🔄 Sending POST request...")
-            response = self.session.post(url, json=payload, timeout=30)
-            logger.info(f"📊 Response status: {response.status_code}")
-            logger.debug(f"📋 Response headers: {dict(response.headers)}")
-            logger.debug(f"📤 Response content: {response.text}")
-            
-            response.raise_for_status()
-            result = response.json()
-            logger.info("✅ Chat request successful")
-            return result
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Chat request failed: {e}")
-            logger.error(f"❌ Error type: {type(e)}")
-            return {"error": str(e)}
-    
+
+        return self._request("POST", self._url_chat, "Chat",
+                             payload=payload, timeout=30,
+                             stream_fields=_CHAT_FIELDS)
+
+    def batch(self, operations: List[Dict[str, Any]]) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """Run several independent operations in a single round-trip.
+
+        POSTs the list to /api/v1/batch and expects a list of results in the
+        same order, collapsing N request round-trips into one. Returns an
+        error dict instead of a list when the call fails (e.g. the server
+        predates the batch endpoint) so callers can fall back to issuing
+        the operations individually.
+        """
+        return self._request("POST", self._url_batch, "Batch",
+                             payload=operations, timeout=60)
+
     def test_vpn_detection(self) -> Dict[str, Any]:
         """Test VPN detection specifically"""
-        return self.send_message("Check my VPN status and provide detailed information")
-    
+        return self.send_message(_VPN_PROBE_MESSAGE)
+
     def test_network_diagnostics(self) -> Dict[str, Any]:
         """Test general network diagnostics"""
-        return self.send_message("Run network diagnostics and check connectivity issues")
+        return self.send_message(_NETWORK_PROBE_MESSAGE)
+
+async def _async_request(client: httpx.AsyncClient, method: str, path: str,
+                         label: str, json_body: Optional[Dict[str, Any]] = None,
+                         timeout: float = 30.0) -> Dict[str, Any]:
+    """Issue one probe request on the shared async client"""
+    logger.info("[REQ] %s request to: %s", label, path)
+    try:
+        response = await client.request(method, path, json=json_body, timeout=timeout)
+        logger.info("[RESP] %s response status: %s", label, response.status_code)
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, json.JSONDecodeError) as e:
+        logger.error("[ERR] %s failed: %s", label, e)
+        return {"error": str(e)}
+
+async def amain(base_url: str, api_key: str) -> List[Dict[str, Any]]:
+    """Run the four sanity probes concurrently over one multiplexed connection.
+
+    The probes are independent, so overlapping them drops the wall-clock
+    cost of the suite from the sum of the four latencies to the slowest one.
+    """
+    headers = {
+        'Content-Type': 'application/json',
+        'Authorization': f'Bearer {api_key}',
+        'Accept-Encoding': 'gzip, deflate'
+    }
+    async with httpx.AsyncClient(base_url=base_url, headers=headers,
+                                 http2=True, timeout=30) as client:
+        return await asyncio.gather(
+            _async_request(client, "GET", "/api/v1/health", "Health check", timeout=10),
+            _async_request(client, "GET", "/api/v1/tools", "Tools list", timeout=10),
+            _async_request(client, "POST", "/api/v1/chat", "VPN detection",
+                           json_body={"message": _VPN_PROBE_MESSAGE, "tools_enabled": True}),
+            _async_request(client, "POST", "/api/v1/chat", "Network diagnostics",
+                           json_body={"message": _NETWORK_PROBE_MESSAGE, "tools_enabled": True}),
+        )
 
 def print_response(title: str, response: Dict[str, Any]):
     """Pretty print API responses"""
-    print(f"\n{'='*60}")
-    print(f"{title}")
-    print(f"{'='*60}")
-    print(json.dumps(response, indent=2, default=str))
+    try:
+        body = orjson.dumps(response, option=orjson.OPT_INDENT_2).decode()
+    except TypeError:
+        # stdlib json with default=str handles the odd value orjson refuses
+        body = json.dumps(response, indent=2, default=str)
+    # One write instead of four print() calls, so large responses hit the
+    # stream (and any pipe reading it) in a single flush
+    sys.stdout.write(f"\n{'='*60}\n{title}\n{'='*60}\n{body}\n")
+    sys.stdout.flush()
 
 def main(client: BreadcrumbsClient = None):
     """Main test function"""
@@ -128,66 +277,80 @@ def main(client: BreadcrumbsClient = None):
     if client is None:
         client = BreadcrumbsClient()
     
-    # Test 1: Health Check
-    print("\n1. Testing Health Check...")
-    health = client.health_check()
+    # Tests 1-4: one round-trip when the server supports /api/v1/batch,
+    # falling back to running the probes concurrently when it doesn't
+    print("\n1-4. Running Health Check, Tools List, VPN Detection and")
+    print("     Network Diagnostics...")
+    probes = client.batch([
+        {"op": "health"},
+        {"op": "tools"},
+        {"op": "chat", "message": _VPN_PROBE_MESSAGE},
+        {"op": "chat", "message": _NETWORK_PROBE_MESSAGE},
+    ])
+    if isinstance(probes, dict):
+        probes = asyncio.run(amain(client.base_url, client.api_key))
+    health, tools, vpn_result, network_result = probes
+
     print_response("Health Check Response", health)
-    
+
     if "error" in health:
         print(f"\n❌ Server is not responding: {health['error']}")
         print("Make sure the breadcrumbs server is running on localhost:8181")
         sys.exit(1)
-    
-    # Test 2: List Available Tools
-    print("\n2. Testing Tools List...")
-    tools = client.list_tools()
+
     print_response("Available Tools", tools)
-    
-    # Test 3: VPN Detection
-    print("\n3. Testing VPN Detection...")
-    vpn_result = client.test_vpn_detection()
     print_response("VPN Detection Result", vpn_result)
-    
-    # Test 4: Network Diagnostics
-    print("\n4. Testing Network Diagnostics...")
-    network_result = client.test_network_diagnostics()
     print_response("Network Diagnostics Result", network_result)
-    
+
     # Test 5: Interactive Mode
     print("\n5. Interactive Mode")
     print("Enter messages to send to the diagnostic AI (type 'quit' to exit):")
     
-    conversation_id = None
-    while True:
+    if sys.stdin.isatty():
         try:
-            message = input("\n> ").strip()
+            import readline  # noqa: F401 - line editing/history for input()
+        except ImportError:
+            pass
+        reader = iter(lambda: input("\n> "), None)
+    else:
+        # Piped message scripts read straight from the buffered stream
+        # instead of paying the interactive prompt per line
+        reader = (line for line in sys.stdin)
+
+    conversation_id = None
+    try:
+        for message in reader:
+            message = message.strip()
             if message.lower() in ['quit', 'exit', 'q']:
                 break
-            
+
             if not message:
                 continue
-            
-            result = client.send_message(message, conversation_id=conversation_id)
-            
-            if "error" in result:
-                print(f"❌ Error: {result['error']}")
-            else:
-                print(f"\n🤖 AI Response: {result.get('response', 'No response')}")
-                if result.get('tools_used'):
-                    print(f"🔧 Tools used: {', '.join(result['tools_used'])}")
-                
-                # Update conversation ID for context
-                conversation_id = result.get('conversation_id')
-        
-        except KeyboardInterrupt:
-            print("\n\nGoodbye!")
-            break
-        except Exception as e:
-            print(f"❌ Error: {e}")
+
+            try:
+                result = client.send_message(message, conversation_id=conversation_id)
+
+                if "error" in result:
+                    print(f"❌ Error: {result['error']}")
+                else:
+                    print(f"\n🤖 AI Response: {result.get('response', 'No response')}")
+                    if result.get('tools_used'):
+                        print(f"🔧 Tools used: {', '.join(result['tools_used'])}")
+
+                    # Update conversation ID for context
+                    conversation_id = result.get('conversation_id')
+            except Exception as e:
+                print(f"❌ Error: {e}")
+    except (KeyboardInterrupt, EOFError):
+        print("\n\nGoodbye!")
 
 if __name__ == "__main__":
     import argparse
-    
+
+    # Configure logging only when run as a script; importing BreadcrumbsClient
+    # from other test code should not touch the root logger
+    logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s')
+
     parser = argparse.ArgumentParser(description='Breadcrumbs API Test Client')
     parser.add_argument('--host', default='localhost', help='Server host (default: localhost)')
     parser.add_argument('--port', type=int, default=8181, help='Server port (default: 8181)')